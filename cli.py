@@ -1,21 +1,23 @@
 # cli.py
 
 from __future__ import annotations
+from contextlib import nullcontext
 from pathlib import Path
+from functools import lru_cache, wraps
 import argparse
-import json
+import atexit
 import logging
+import sqlite3
 import sys
 
-from typing import Optional
+from typing import Any, Callable, List, Optional
 
 from . import __version__
-from .db import get_connection, init_db
-from .validators import (validate_date_iso, validate_amount, validate_category, validate_id,)
-from .services import list_expenses, add_expense, update_expense, delete_expense
-from .renderers import (render_expenses_table, render_report_by_category, render_report_range)
-from .reports import by_category, range_summary
-from .exporters import export_to_csv, export_to_json
+from .db import get_connection, init_db, close_connection
+from .validators import (validate_date_iso, validate_amount, validate_category, validate_id,
+                         normalize_category_filter,)
+from .services import (list_expenses, iter_expenses, add_expense, add_expenses_bulk, update_expense, 
+                       delete_expense, next_cursor, encode_cursor, decode_cursor, EXPENSE_COLUMNS)
 from .logger import logging_cfg
 
 
@@ -23,6 +25,10 @@ DEFAULT_DB = Path.cwd() / "expenses.db"
 
 logger = logging.getLogger(__name__)
 
+# Arguments of 'list' and 'export' passed as they are to the expenses query
+_LIST_KEYS = ("date_from", "date_to", "category", "min_amount", "max_amount", "text",
+              "order_by", "desc", "limit", "offset")
+
 def err(msg: str) -> None:
     """Generate a normalized error message.
 
@@ -31,59 +37,149 @@ def err(msg: str) -> None:
     """
     print(msg, file=sys.stderr)
 
-def build_parser() -> argparse.ArgumentParser:
-    """Parser of the Expense Tracker CLI.
+@lru_cache(maxsize=4)
+def _open(db_path: str) -> sqlite3.Connection:
+    """Open a SQLite connection once per database path and reuse it for the rest of the process.
+
+    The connection is closed (after a PRAGMA optimize) when the process exits.
+
+    Args:
+        db_path: Path to the SQLite database.
 
     Returns:
-        argparse.ArgumentParser: Configured parser with supported commands and options.
+        sqlite3.Connection: Shared SQLite connection.
     """
-    # Parser creation 
-    parser = argparse.ArgumentParser(prog="expense_tracker", description="Expense Tracker CLI")
-    parser.add_argument("--db", type=str, default=str(DEFAULT_DB), help="Path to the Database file")
-    parser.add_argument("--debug", action="store_true", help="Enable debug output")
-    parser.add_argument("--version", action="version", version=f"expense-tracker {__version__}")
-    
-    # Sub parser section
-    sub = parser.add_subparsers(dest="command", required=True)
-    
-    sub.add_parser("init", help="Initialize database (tables and indexes)")
+    conn = get_connection(db_path)
+    atexit.register(close_connection, conn)
+    return conn
+
+def with_conn(name: str, check: Optional[Callable[[Any], Optional[int]]] = None):
+    """Decorator for the commands that work on the database.
+
+    The command gets the shared connection (see _open) instead of the database path, 
+    and any unexpected error is reported to the user and logged in one place.
+
+    Args:
+        name: Command name used in the error messages.
+        check (optional): Argument checks, run before the database is opened (so a 
+            rejected command doesn't create the database file). Returns the exit code 
+            when the arguments are rejected, None otherwise.
+
+    Returns:
+        Decorator that turns command(args, conn) into command(args, db_path).
+    """
+    def decorator(command):
+        @wraps(command)
+        def wrapper(args, db_path: str) -> int:
+            if check is not None:
+                code = check(args)
+                if code is not None:
+                    return code
+            try:
+                return command(args, _open(db_path))
+            except Exception as e:
+                err(f"cmd_{name} failed: {e}")
+                logger.exception("%s failed.", name)
+                return 1
+        return wrapper
+    return decorator
+
+class _TextWriter:
+    """Binary writer over a text-only stream (e.g. a StringIO set by redirect_stdout)."""
+    
+    def __init__(self, stream) -> None:
+        self.stream = stream
+    
+    def write(self, data: bytes) -> int:
+        # Every chunk written is complete UTF-8 (whole JSON values and separators)
+        return self.stream.write(data.decode("utf-8"))
+
+def stdout_binary():
+    """Binary stream of stdout for the encoded output.
+
+    Returns:
+        sys.stdout.buffer (flushed first, so the text already printed stays in order), 
+        or a _TextWriter when stdout has no binary buffer.
+    """
+    buffer = getattr(sys.stdout, "buffer", None)
+    if buffer is None:
+        return _TextWriter(sys.stdout)
+    sys.stdout.flush()
+    return buffer
+
+def print_json(obj) -> None:
+    """Print an object as indented JSON, the encoded bytes go straight to stdout.
+
+    Args:
+        obj: Object to print.
+    """
+    from .exporters import dumps_json
     
-    # List subparser
-    sub_list = sub.add_parser("list", help="List the expenses with filters")
+    stdout_binary().write(dumps_json(obj, pretty=True) + b"\n")
+
+def print_table(table: str) -> None:
+    """Write a rendered table to stdout in a single call.
+
+    Args:
+        table: Rendered table.
+    """
+    sys.stdout.write(table)
+    sys.stdout.write("\n")
+
+def print_next_cursor(args, rows) -> None:
+    """Print the cursor of the next page to stderr when the current page is full.
+
+    Args:
+        args: Parsed CLI arguments.
+        rows: Rows of the current page.
+    """
+    if args.limit and len(rows) == args.limit:
+        print(f"Next cursor: {encode_cursor(next_cursor(rows, args.order_by), args.order_by)}", file=sys.stderr)
+
+def _configure_list(sub_list: argparse.ArgumentParser) -> None:
+    """Arguments of the 'list' command."""
     sub_list.add_argument("--from", dest="date_from", type=validate_date_iso, help="Start date. YYYY-MM-DD")
     sub_list.add_argument("--to", dest="date_to", type=validate_date_iso, help="End date. (YYY-MM-DD)")
-    sub_list.add_argument("--category", type=str, help="Filter by category")
+    sub_list.add_argument("--category", type=normalize_category_filter, help="Filter by category")
     sub_list.add_argument("--min", dest="min_amount", type=float, help="Min amount")
     sub_list.add_argument("--max", dest="max_amount", type=float, help="Max amount")
     sub_list.add_argument("--text", type=str, help="String to be search in note or category")
+    sub_list.add_argument("--substring", action="store_true", help="Match --text anywhere in the words (slower, no index)")
     sub_list.add_argument("--order-by", choices=["amount", "date", "category", "id"], help="Column to order by")
     sub_list.add_argument("--desc", action="store_true", help="Order by descending")
     sub_list.add_argument("--limit", type=int, help="Limit the number of rows")
-    sub_list.add_argument("--offset", type=int, help="Offset for pagination")
+    sub_list.add_argument("--offset", type=int, help="Offset for pagination (deprecated, use --after)")
+    sub_list.add_argument("--after", type=str, help="Cursor printed by the previous page (pagination)")
     sub_list.add_argument("--format", choices=["table", "json"], default="table", help="Output format")
 
-    # Add subparser
-    sub_add = sub.add_parser("add", help="Add a new expense to the table")
+def _configure_add(sub_add: argparse.ArgumentParser) -> None:
+    """Arguments of the 'add' command."""
     sub_add.add_argument("--date", required=True, type=validate_date_iso, help="YYYY-MM-DD")
     sub_add.add_argument("--category", required=True, type=validate_category, help="Category")
     sub_add.add_argument("--amount", required=True, type=validate_amount, help="Amount (> 0)")
     sub_add.add_argument("--note", required=False, type=str, help="Optional note")
-    
-    # Update subparser
-    sub_update = sub.add_parser("update", help="Update an existing expense from the table")
+
+def _configure_bulk_add(sub_bulk_add: argparse.ArgumentParser) -> None:
+    """Arguments of the 'bulk-add' command."""
+    sub_bulk_add.add_argument("--input", type=str, default="-", help="Source file, '-' reads from stdin")
+    sub_bulk_add.add_argument("--format", choices=["csv", "json"], default="csv", 
+                              help="CSV with a date,category,amount,note header or a JSON array of objects")
+
+def _configure_update(sub_update: argparse.ArgumentParser) -> None:
+    """Arguments of the 'update' command."""
     sub_update.add_argument("id", type=validate_id, help="Expense ID")
     sub_update.add_argument("--date", type=validate_date_iso, help="YYYY-MM-DD")
     sub_update.add_argument("--category", type=validate_category, help="Category")
     sub_update.add_argument("--amount", type=validate_amount, help="Amount (> 0)")
     sub_update.add_argument("--note", type=str, help="Note")
-    
-    # Delete subparser
-    sub_delete = sub.add_parser("delete", help="Delete an expense by ID")
+
+def _configure_delete(sub_delete: argparse.ArgumentParser) -> None:
+    """Arguments of the 'delete' command."""
     sub_delete.add_argument("id", type=validate_id, help="Expense ID")
     sub_delete.add_argument("--yes", action="store_true", help="Confirm deletion")
-    
-    # Report (category and range)
-    sub_report = sub.add_parser("report", help="Reports")
+
+def _configure_report(sub_report: argparse.ArgumentParser) -> None:
+    """Subcommands of the 'report' command (category and range)."""
     report = sub_report.add_subparsers(dest="report_cmd", required=True)
     
     # Report Category subparser
@@ -93,6 +189,7 @@ def build_parser() -> argparse.ArgumentParser:
     sub_report_cat.add_argument("--min", dest="min_amount", type=float, help="Min amount")
     sub_report_cat.add_argument("--max", dest="max_amount", type=float, help="Max amount")
     sub_report_cat.add_argument("--text", type=str, help="String to be search in note or category")
+    sub_report_cat.add_argument("--substring", action="store_true", help="Match --text anywhere in the words (slower, no index)")
     sub_report_cat.add_argument("--top", type=int, help="Show only the top categories")
     sub_report_cat.add_argument("--format", choices=["table","json"], default="table", help="Format")
     
@@ -103,25 +200,71 @@ def build_parser() -> argparse.ArgumentParser:
     sub_report_range.add_argument("--min", dest="min_amount", type=float, help="Min amount")
     sub_report_range.add_argument("--max", dest="max_amount", type=float, help="Max amount")
     sub_report_range.add_argument("--text", type=str, help="String to be search in note or category")
+    sub_report_range.add_argument("--substring", action="store_true", help="Match --text anywhere in the words (slower, no index)")
     sub_report_range.add_argument("--format", choices=["table","json"], default="table", help="Format")
-    
-    # Export subparser
-    sub_export = sub.add_parser("export", help="Export expenses to CSV or JSON files")
+
+def _configure_export(sub_export: argparse.ArgumentParser) -> None:
+    """Arguments of the 'export' command."""
     sub_export.add_argument("--format", required=True, choices=["csv", "json"], help="Export format")
     sub_export.add_argument("--dest", required=True, type=str, help="Destination path")
     sub_export.add_argument("--from", dest="date_from", type=validate_date_iso, help="Start date. YYYY-MM-DD")
     sub_export.add_argument("--to", dest="date_to", type=validate_date_iso, help="Start date. YYYY-MM-DD")
-    sub_export.add_argument("--category", type=str, help="Filter by category")
+    sub_export.add_argument("--category", type=normalize_category_filter, help="Filter by category")
     sub_export.add_argument("--min", dest="min_amount", type=float, help="Min amount")
     sub_export.add_argument("--max", dest="max_amount", type=float, help="Max amount")
     sub_export.add_argument("--text", type=str, help="String to be search in note or category")
+    sub_export.add_argument("--substring", action="store_true", help="Match --text anywhere in the words (slower, no index)")
     sub_export.add_argument("--order-by", choices=["amount", "date", "category", "id"], help="Column to order by")
     sub_export.add_argument("--desc", action="store_true", help="Order descending")
     sub_export.add_argument("--limit", type=int, help="Limit number of rows")
-    sub_export.add_argument("--offset", type=int, help="Offset for pagination")
+    sub_export.add_argument("--offset", type=int, help="Offset for pagination (deprecated, use --after)")
+    sub_export.add_argument("--after", type=str, help="Cursor printed by the previous page (pagination)")
     sub_export.add_argument("--fields", type=str, help="fields (comma-separated)")
     sub_export.add_argument("--force", action="store_true", help="Overwrite destination file if it exists")
     sub_export.add_argument("--pretty", action="store_true", help="Pretty JSON format")
+
+# Subcommands: name -> (help, function that registers its arguments)
+COMMANDS = {
+    "init": ("Initialize database (tables and indexes)", None),
+    "list": ("List the expenses with filters", _configure_list),
+    "add": ("Add a new expense to the table", _configure_add),
+    "bulk-add": ("Add many expenses from a CSV or JSON file in one transaction", _configure_bulk_add),
+    "update": ("Update an existing expense from the table", _configure_update),
+    "delete": ("Delete an expense by ID", _configure_delete),
+    "report": ("Reports", _configure_report),
+    "export": ("Export expenses to CSV or JSON files", _configure_export),
+}
+
+@lru_cache(maxsize=None)
+def build_parser(command: Optional[str] = None, *, skeleton: bool = False) -> argparse.ArgumentParser:
+    """Parser of the Expense Tracker CLI.
+
+    Only the arguments of the selected command are registered, the other subcommands 
+    are placeholders. The parsers are cached, so repeated main() calls reuse them.
+
+    Args:
+        command (optional): Command to configure. Every command when None.
+        skeleton (optional): Only the global options and the subcommand names, 
+            used as a first pass to find the command.
+
+    Returns:
+        argparse.ArgumentParser: Configured parser with supported commands and options.
+    """
+    # Parser creation 
+    parser = argparse.ArgumentParser(prog="expense_tracker", description="Expense Tracker CLI")
+    parser.add_argument("--db", type=str, default=str(DEFAULT_DB), help="Path to the Database file")
+    parser.add_argument("--debug", action="store_true", help="Enable debug output")
+    parser.add_argument("--version", action="version", version=f"expense-tracker {__version__}")
+    
+    # Sub parser section
+    sub = parser.add_subparsers(dest="command", required=True)
+    
+    for name, (help_text, configure) in COMMANDS.items():
+        selected = not skeleton and command in (None, name)
+        # Placeholders leave --help to the parser of the selected command.
+        sub_parser = sub.add_parser(name, help=help_text, add_help=selected)
+        if selected and configure is not None:
+            configure(sub_parser)
     
     return parser
 
@@ -136,11 +279,8 @@ def cmd_init(db_path: str, logger) -> int:
     """
     try:
         
-        conn = get_connection(db_path)
-        try:
-            init_db(conn)
-        finally:
-            conn.close()
+        conn = _open(db_path)
+        init_db(conn)
         print(f"Database initialized at: {db_path}")
         logger.info("DB initialized at %s", db_path)
         return 0
@@ -149,291 +289,323 @@ def cmd_init(db_path: str, logger) -> int:
         logger.exception("init failed")
         return 2
 
-def cmd_list(args, db_path: str) -> int:
+@with_conn("list")
+def cmd_list(args, conn: sqlite3.Connection) -> int:
     """Executes the command 'list', querying expenses from the db based on filters and outputs the result in the right format.
 
     Args:
         args: Parsed CLI arguments.
-        db_path: Path to the SQLite database.
+        conn: Shared SQLite connection.
 
     Returns:
         int: Exit Code.
     """
-    conn = None 
-    try: 
-        conn = get_connection(db_path)
-    
-        # Ordering the list
-        rows = list_expenses(
-                conn,
-                date_from = args.date_from,
-                date_to = args.date_to,
-                category = args.category.strip() if args.category else None,
-                min_amount = args.min_amount,
-                max_amount = args.max_amount,
-                text = args.text,
-                order_by = args.order_by,
-                desc = bool(args.desc),
-                limit = args.limit,
-                offset = args.offset,
-        )
-        
-        # logger output 
-        if not rows:
-            logger.warning("No expenses found to execute the 'list' command.")
-        else:
-            logger.info("Listed %d expenses from %s", len(rows), db_path)
-        
-        # User Output
-        if args.format == "json":
-            print(json.dumps(rows, ensure_ascii=False, indent=2))
-        else:
-            print(render_expenses_table(rows))
-        return 0
-    
-    except Exception as e:
-        err(f"cmd_list failed: {e}")
-        logger.exception("list failed.")
-        return 1
-
-    finally:
-        if conn:
-            conn.close() 
-
-def cmd_add(args, db_path: str) -> int:
+    # Imported here, only this command needs them
+    from .exporters import write_json
+    from .renderers import render_expenses_table
+    
+    # Pagination cursor
+    after = decode_cursor(args.after, args.order_by) if args.after else None
+    if args.offset is not None:
+        logger.warning("--offset is deprecated, use --after instead.")
+
+    # Ordering the list (streamed for JSON, the table needs every row to be rendered)
+    # --offset is deprecated but still honored (legacy_offset)
+    rows = list_expenses(conn, after=after, legacy_offset=True, stream=(args.format == "json"),
+                         use_fts=not args.substring, **{key: getattr(args, key) for key in _LIST_KEYS})
+    # A page is bounded by --limit, it is kept to build the next cursor.
+    if args.limit:
+        rows = list(rows)
+    
+    # User Output
+    if args.format == "json":
+        out = stdout_binary()
+        count = write_json(rows, out, pretty=True)
+        out.write(b"\n")
+    else:
+        count = len(rows)
+        print_table(render_expenses_table(rows))
+    print_next_cursor(args, rows)
+    
+    # logger output 
+    if not count:
+        logger.warning("No expenses found to execute the 'list' command.")
+    elif logger.isEnabledFor(logging.INFO):
+        logger.info("Listed %d expenses from %s", count, args.db)
+    return 0
+
+@with_conn("add")
+def cmd_add(args, conn: sqlite3.Connection) -> int:
     """Executes the command 'add', add a new expense. 
 
     Args:
         args: Parsed CLI arguments. 
-        db_path: Path to the SQLite database.
+        conn: Shared SQLite connection.
 
     Returns:
         int: Exit Code.
     """
-    conn = None
-    
-    try:
-        conn = get_connection(db_path)
-    
-        # New expense format
-        new_id = add_expense(
-            conn, 
-            date=args.date, 
-            category=args.category, 
-            amount=args.amount, 
-            note=args.note,
-        )
+    # New expense format (the arguments were validated by the parser)
+    new_id = add_expense(
+        conn, 
+        date=args.date, 
+        category=args.category, 
+        amount=args.amount, 
+        note=args.note,
+        skip_validate=True,
+    )
+    if logger.isEnabledFor(logging.INFO):
         logger.info("Expense added succesfuly: (ID = %s, category=%s, amount=%s)",
                     new_id, args.category, args.amount)
-        print(f"Expense added. ID = {new_id}")
-        return 0
-    
-    except Exception as e:
-        err(f"cmd_add failed: {e}")
-        logger.exception("add failed.")
-    
-    finally:
-        if conn:
-            conn.close()
+    print(f"Expense added. ID = {new_id}")
+    return 0
+
+def read_bulk_rows(file, file_format: str):
+    """Read and validate the expenses of a bulk file, one row at a time.
+
+    Args:
+        file: Open text stream.
+        file_format: 'csv' or 'json'.
+
+    Raises:
+        ValueError: If a row is invalid (the row number is part of the message).
+
+    Yields:
+        tuple: (date, category, amount, note) ready to be inserted.
+    """
+    if file_format == "csv":
+        import csv
+        records = csv.DictReader(file)
+    else:
+        import json
+        records = json.load(file)
+        if not isinstance(records, list):
+            raise ValueError("JSON input must be an array of objects.")
     
-def cmd_update(args, db_path: str) -> int:
-    """Executes the command 'update'. Update the fields of an existing expense.
+    for number, record in enumerate(records, start=1):
+        try:
+            if not isinstance(record, dict):
+                raise ValueError("expected an object with date, category, amount and note")
+            # JSON values can be of any type, the text fields must be strings.
+            category = record.get("category")
+            if category is not None and not isinstance(category, str):
+                raise ValueError(f"category must be a string; got {category!r}.")
+            note = record.get("note")
+            if not isinstance(note, (str, type(None))):
+                raise ValueError(f"note must be a string; got {note!r}.")
+            yield (
+                validate_date_iso(record.get("date")),
+                validate_category(category),
+                validate_amount(record.get("amount")),
+                # An empty note (e.g. an empty CSV cell) is stored as NULL
+                None if note is None or note == "" else note,
+            )
+        except ValueError as e:
+            raise ValueError(f"row {number}: {e}")
+
+@with_conn("bulk_add")
+def cmd_bulk_add(args, conn: sqlite3.Connection) -> int:
+    """Executes the command 'bulk-add', add every expense of a CSV or JSON input in one transaction.
 
     Args:
         args: Parsed CLI arguments. 
-        db_path: Path to the SQLite database.
+        conn: Shared SQLite connection.
 
     Returns:
-        int: Exit Code
+        int: Exit Code.
     """
-    # Checking that there's at least 1 field to update.
-    if all(value is None for value in (args.date, args.category, args.amount, args.note)):
-        print("There is no fields to be updated. One field is required at least.")
-        logger.warning("cmd_update called with nothing to update: (id=%s)", args.id)
-        return 2
-
-    conn = None
-    
-    # Format
     try:
-        conn = get_connection(db_path)
+        # stdin is not closed after reading
+        if args.input == "-":
+            source = nullcontext(sys.stdin)
+        else:
+            source = open(args.input, encoding="utf-8", newline="")
         
-        rows = update_expense(
-            conn, 
-            args.id, 
-            args.date, 
-            args.category, 
-            args.amount, 
-            args.note)
+        with source as file:
+            # read_bulk_rows already validated every row
+            count = len(add_expenses_bulk(conn, read_bulk_rows(file, args.format), skip_validate=True))
     
-        # Format printing alternatives
-        if rows == 0: 
-            logger.warning("No expense found to update: (id=%s)", args.id)
-            print("There is no expense that match.")
-        else:
-            logger.info("Updated %d row(s): (id=%s)", rows, args.id)
-            print(f"Updated {rows} row(s).")
-        return 0
+    except ValueError as e:
+        logger.warning("Invalid bulk input, nothing was added: (input=%s) %s", args.input, e)
+        print(f"Invalid input, nothing was added: {e}")
+        return 2
     
-    except Exception as e:
-        err(f"cmd_update failed: {e}")
-        logger.exception("update failed.")
+    except OSError as e:
+        logger.exception("I/O error reading bulk input: (input=%s)", args.input)
+        print(f"I/O error reading {args.input}: {e}")
+        return 2
+    
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("Bulk added %d expense(s) from %s (format=%s)", count, args.input, args.format)
+    print(f"Added {count} expense(s).")
+    return 0
 
-    finally:
-        if conn:
-            conn.close()
+def _check_update(args) -> Optional[int]:
+    """Arguments check of 'update': at least 1 field to update."""
+    if all(value is None for value in (args.date, args.category, args.amount, args.note)):
+        print("There is no fields to be updated. One field is required at least.")
+        logger.warning("cmd_update called with nothing to update: (id=%s)", args.id)
+        return 2
+    return None
 
-def cmd_delete(args, db_path: str) -> int:
-    """Executes the command 'delete'. Delete an expense using an ID.
+@with_conn("update", check=_check_update)
+def cmd_update(args, conn: sqlite3.Connection) -> int:
+    """Executes the command 'update'. Update the fields of an existing expense.
 
     Args:
         args: Parsed CLI arguments. 
-        db_path: Path to the SQLite database.
+        conn: Shared SQLite connection.
 
     Returns:
         int: Exit Code
     """
-    # Verification to prevent accidental deletes.
+    # Format
+    rows = update_expense(
+        conn, 
+        args.id, 
+        date=args.date, 
+        category=args.category, 
+        amount=args.amount, 
+        note=args.note,
+    )
+
+    # Format printing alternatives
+    if rows == 0: 
+        logger.warning("No expense found to update: (id=%s)", args.id)
+        print("There is no expense that match.")
+    else:
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Updated %d row(s): (id=%s)", rows, args.id)
+        print(f"Updated {rows} row(s).")
+    return 0
+
+def _check_delete(args) -> Optional[int]:
+    """Arguments check of 'delete': --yes prevents accidental deletes."""
     if not args.yes:
         print("--yes is requiered to delete.")
         logger.warning("cmd_delete called without confirmation (--yes): (id=%s)", args.id)
         return 2
+    return None
+
+@with_conn("delete", check=_check_delete)
+def cmd_delete(args, conn: sqlite3.Connection) -> int:
+    """Executes the command 'delete'. Delete an expense using an ID.
+
+    Args:
+        args: Parsed CLI arguments. 
+        conn: Shared SQLite connection.
+
+    Returns:
+        int: Exit Code
+    """
+    rows = delete_expense(conn, args.id)
     
-    conn = None
-    
-    try:
-        conn = get_connection(db_path)
-        rows = delete_expense(conn, args.id)
-        
-        # Checks if there's anything to delete
-        if rows == 0:
-            logger.warning("No expense found to delete: (id=%s)", args.id)
-            print("There is no expense that match.")
-        else:
+    # Checks if there's anything to delete
+    if rows == 0:
+        logger.warning("No expense found to delete: (id=%s)", args.id)
+        print("There is no expense that match.")
+    else:
+        if logger.isEnabledFor(logging.INFO):
             logger.info("Deleted %d row(s): (id=%s)", rows, args.id)
-            print(f"Deleted {rows} row(s).")
-        return 0
-    
-    except Exception as e:
-        err(f"cmd_delete failed: {e}")
-        logger.exception("delete failed.")
-
-    finally:
-        if conn:
-            conn.close()
+        print(f"Deleted {rows} row(s).")
+    return 0
+
+def _check_report_category(args) -> Optional[int]:
+    """Arguments check of 'report category': --top must be positive."""
+    if args.top is not None and args.top <= 0:
+        print("--top must be a positive integer.")
+        logger.warning("cmd_report_category called with a non positive --top: (top=%s)", args.top)
+        return 2
+    return None
 
-def cmd_report_category(args, db_path: str) -> int:
+@with_conn("report_category", check=_check_report_category)
+def cmd_report_category(args, conn: sqlite3.Connection) -> int:
     """Executes the command 'report category'; render the output and print it.
 
     Args:
         args: Parsed CLI arguments. 
-        db_path: Path to the SQLite database.
+        conn: Shared SQLite connection.
 
     Returns:
         int: Exit code.
     """
-    conn = None
+    # Imported here, only this command needs them
+    from .reports import by_category
+    from .renderers import render_report_by_category
     
     # Format
-    try:
-        conn = get_connection(db_path)
-        rows = by_category(
-            conn,
-            date_from = args.date_from,
-            date_to = args.date_to,
-            min_amount = args.min_amount,
-            max_amount = args.max_amount,
-            text = args.text,
-        )
-        
-        # Checking types and positives
-        if args.top is not None:
-            if args.top > 0:
-                print("--top must be a positive integer.")
-                logger.warning("")
-                return 2
-            rows = rows[: args.top]
-        
-        if not rows:
-            logger.warning("Report by category returned nothing")
-        else:
-            logger.info("Report by category generated with %d rows", len(rows))
-        
-        # User output
-        if args.format == 'json':
-            print(json.dumps(rows, ensure_ascii=False, indent=2))
-        else:
-            print(render_report_by_category(rows))
-        return 0
-    
-    except Exception as e:
-        err(f"cmd_report_category failed: {e}")
-        logger.exception("report by category failed.")
-        return 1
-
-    finally:
-        if conn:
-            conn.close()
+    rows = by_category(
+        conn,
+        date_from = args.date_from,
+        date_to = args.date_to,
+        min_amount = args.min_amount,
+        max_amount = args.max_amount,
+        text = args.text,
+        top = args.top,
+        use_fts = not args.substring,
+    )
+    
+    if not rows:
+        logger.warning("Report by category returned nothing")
+    elif logger.isEnabledFor(logging.INFO):
+        logger.info("Report by category generated with %d rows", len(rows))
+    
+    # User output
+    if args.format == 'json':
+        print_json(rows)
+    else:
+        print_table(render_report_by_category(rows))
+    return 0
 
-def cmd_report_range(args, db_path: str) -> int:
+@with_conn("report_range")
+def cmd_report_range(args, conn: sqlite3.Connection) -> int:
     """Executes the command 'report range'; render the output and print it.
 
     Args:
         args: Parsed CLI arguments. 
-        db_path: Path to the SQLite database.
+        conn: Shared SQLite connection.
 
     Returns:
         int: Exit code.
     """
-    conn = None
-
-    # Format 
-    try:
-        conn = get_connection(db_path)
-        summary = range_summary(
-            conn,
-            date_from = args.date_from,
-            date_to = args.date_to,
-            min_amount = args.min_amount,
-            max_amount = args.max_amount,
-            text = args.text,
-        )
-        
-        if not summary:
-            logger.warning("Report by range of dates returned nothing.")
-        else:
-            total = summary.get("total_amount") if isinstance(summary, dict) else None
-            count = summary.get("count") if isinstance(summary, dict) else None
-            logger.info("Report range generated: (count=%s), total=%s, from=%s, to=%s",
-                        count, total, args.date_from, args.date_to)
-
-        # User Output
-        if args.format == 'json':
-            print(json.dumps(summary, ensure_ascii=False, indent=2))
-        else:
-            print(render_report_range(summary))
-        return 0
+    # Imported here, only this command needs them
+    from .reports import range_summary
+    from .renderers import render_report_range
     
-    except Exception as e:
-        err(f"cmd_report_range failed: {e}")
-        logger.exception("report by range failed.")
-        return 1
-
-    finally:
-        if conn:
-            conn.close()
+    # Format 
+    summary = range_summary(
+        conn,
+        date_from = args.date_from,
+        date_to = args.date_to,
+        min_amount = args.min_amount,
+        max_amount = args.max_amount,
+        text = args.text,
+        use_fts = not args.substring,
+    )
+    
+    if not summary:
+        logger.warning("Report by range of dates returned nothing.")
+    elif logger.isEnabledFor(logging.INFO):
+        logger.info("Report range generated: (count=%s), total=%s, from=%s, to=%s",
+                    summary.get("count"), summary.get("total"), args.date_from, args.date_to)
+
+    # User Output
+    if args.format == 'json':
+        print_json(summary)
+    else:
+        print_table(render_report_range(summary))
+    return 0
 
-def cmd_export(args, db_path: str) -> int:
-    """Executes the command 'export'; export the selected data into a CSV or JSON file.
+def _export_fields(args) -> Optional[List[str]]:
+    """Fields to export given by --fields (all of them by default), None if they are invalid.
 
     Args:
-        args: Parsed CLI arguments. 
-        db_path: Path to the SQLite database.
+        args: Parsed CLI arguments.
 
     Returns:
-        int: Exit code.
+        Optional[List[str]]: Fields to export.
     """
-    allowed_fields = ["id", "date", "category", "amount", "note"]
+    allowed_fields = list(EXPENSE_COLUMNS)
     
     # Checking the fields
     if args.fields:
@@ -441,7 +613,7 @@ def cmd_export(args, db_path: str) -> int:
         if not fields:
             print("fields can't be empty.")
             logger.warning("Empty --fields argument received.")
-            return 2
+            return None
     else:
         fields = allowed_fields[:]
     
@@ -450,30 +622,45 @@ def cmd_export(args, db_path: str) -> int:
     if unknown:
         print(f"Unknown field detected: {', '.join(unknown)}")
         logger.warning("Unknown export fields: %s", unknown)
-        return 2 
+        return None
+    return fields
+
+def _check_export(args) -> Optional[int]:
+    """Arguments check of 'export': the --fields must be valid."""
+    return 2 if _export_fields(args) is None else None
+
+@with_conn("export", check=_check_export)
+def cmd_export(args, conn: sqlite3.Connection) -> int:
+    """Executes the command 'export'; export the selected data into a CSV or JSON file.
+
+    Args:
+        args: Parsed CLI arguments. 
+        conn: Shared SQLite connection.
+
+    Returns:
+        int: Exit code.
+    """
+    # Imported here, only this command needs them
+    from .exporters import export_to_csv, export_to_json
     
-    conn = None
+    # Already validated by _check_export
+    fields = _export_fields(args)
+    
+    # Pagination cursor
+    after = decode_cursor(args.after, args.order_by) if args.after else None
+    if args.offset is not None:
+        logger.warning("--offset is deprecated, use --after instead.")
     
     # Format
     try:
-        conn = get_connection(db_path)
-        rows = list_expenses(
-            conn,
-            date_from = args.date_from,
-            date_to = args.date_to,
-            category = (args.category.strip() if args.category else None),
-            min_amount = args.min_amount,
-            max_amount = args.max_amount,
-            text = args.text,
-            order_by = args.order_by,
-            desc = bool(args.desc),
-            limit = args.limit,
-            offset = args.offset,
-        )
-        
-        # If the user wants less of the allowed fields
-        if fields != allowed_fields:
-            rows = [{key: r.get(key) for key in fields} for r in rows]
+        rows = iter_expenses(conn, after=after, columns=fields, legacy_offset=True,
+                             use_fts=not args.substring, **{key: getattr(args, key) for key in _LIST_KEYS})
+        # A page is bounded by --limit, it is kept to build the next cursor
+        # (only when the cursor columns are part of the exported fields).
+        if args.limit:
+            rows = list(rows)
+            if {"id", args.order_by or "id"}.issubset(fields):
+                print_next_cursor(args, rows)
         
         # In case the user use --pretty in CSV
         if args.format == "csv" and args.pretty:
@@ -484,24 +671,15 @@ def cmd_export(args, db_path: str) -> int:
        
         # CSV format
         if args.format == "csv":
-            export_to_csv(rows, dest=args.dest,
+            count = export_to_csv(rows, dest=args.dest,
                           columns=fields,
                           overwrite=bool(args.force))
         # JSON format
         else:
-            export_to_json(rows, dest=args.dest,
+            count = export_to_json(rows, dest=args.dest,
                           overwrite=bool(args.force),
                           pretty=bool(args.pretty)) 
     
-        # logs and User Ouput
-        if not rows:
-                logger.warning("Export completed: (dest=%s, format=%s)", args.dest, args.format)
-        else:
-                logger.info("Exported %d row(s) to %s (format=%s)", len(rows), args.dest, args.format)
-    
-        print(f"Exported {len(rows)} row(s) to {args.dest}")
-        return 0 
-    
     except FileExistsError:
         logger.warning("Destination already exists and --force not provided: (dest=%s)", args.dest)
         print(f"The file {args.dest} already exists. If you want to overwrite, use --force")
@@ -512,14 +690,14 @@ def cmd_export(args, db_path: str) -> int:
         print(f"I/O error writing to {args.dest}: {e}")
         return 2
     
-    except Exception as e:
-        err(f"cmd_export failed: {e}")
-        logger.exception("export failed.")
-        return 1
+    # logs and User Ouput
+    if not count:
+        logger.warning("Export completed: (dest=%s, format=%s)", args.dest, args.format)
+    elif logger.isEnabledFor(logging.INFO):
+        logger.info("Exported %d row(s) to %s (format=%s)", count, args.dest, args.format)
 
-    finally:
-        if conn:
-            conn.close()
+    print(f"Exported {count} row(s) to {args.dest}")
+    return 0 
 
 def main(argv: list[str] | None = None) -> int:
     """Entry point for the Expense Tracker CLI. 
@@ -530,7 +708,9 @@ def main(argv: list[str] | None = None) -> int:
     Returns:
         int: Exit Code.
     """
-    parser = build_parser()
+    # First pass only finds the command, the second one parses its arguments.
+    command = build_parser(skeleton=True).parse_known_args(argv)[0].command
+    parser = build_parser(command)
     args = parser.parse_args(argv)
     db_path = args.db
     logger = logging_cfg(debug=bool(args.debug))
@@ -544,6 +724,8 @@ def main(argv: list[str] | None = None) -> int:
             return cmd_list(args, db_path)
         elif args.command == "add":
             return cmd_add(args, db_path)
+        elif args.command == "bulk-add":
+            return cmd_bulk_add(args, db_path)
         elif args.command == "update":
             return cmd_update(args, db_path)
         elif args.command == "delete":
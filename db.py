@@ -4,13 +4,14 @@ from __future__ import annotations
 from pathlib import Path
 import sqlite3
 import logging
+import weakref
 
 logger = logging.getLogger(__name__)
 
 SCHEMA_SQL = """
 CREATE TABLE IF NOT EXISTS expenses (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
-    date TEXT NOT NULL, -- ISO YYYY-MM-DD
+    date TEXT NOT NULL CHECK (date GLOB '[0-9][0-9][0-9][0-9]-[0-9][0-9]-[0-9][0-9]'), -- ISO YYYY-MM-DD
     category TEXT NOT NULL,
     amount REAL NOT NULL,
     note TEXT
@@ -19,9 +20,55 @@ CREATE TABLE IF NOT EXISTS expenses (
 
 INDEXES_SQL = [
     "CREATE INDEX IF NOT EXISTS idx_expenses_date ON expenses(date);",
-    "CREATE INDEX IF NOT EXISTS idx_expenses_category ON expenses(category);"
+    "CREATE INDEX IF NOT EXISTS idx_expenses_category ON expenses(category);",
+    # Composite indexes for the date range + category + amount filters used by list/report/export.
+    "CREATE INDEX IF NOT EXISTS idx_exp_date_cat_amt ON expenses(date, category, amount);",
+    "CREATE INDEX IF NOT EXISTS idx_exp_cat_date ON expenses(category, date);",
+    # Keyset pagination seeks on (order_by, id): every index ends with the rowid (id),
+    # so idx_expenses_date, idx_expenses_category and this one already cover it.
+    "CREATE INDEX IF NOT EXISTS idx_expenses_amount ON expenses(amount);",
 ]
 
+# Rows needed before init_db runs ANALYZE
+ANALYZE_MIN_ROWS = 10_000
+
+# Indexes created by older versions that no query uses (they only slow down the writes)
+OBSOLETE_INDEXES_SQL = [
+    "DROP INDEX IF EXISTS idx_exp_note_nn;",
+]
+
+# Full text index of note and category (external content, kept in sync by triggers)
+FTS_SQL = """
+CREATE VIRTUAL TABLE IF NOT EXISTS expenses_fts USING fts5(note, category, content='expenses', content_rowid='id');
+CREATE TRIGGER IF NOT EXISTS expenses_fts_ai AFTER INSERT ON expenses BEGIN
+    INSERT INTO expenses_fts(rowid, note, category) VALUES (new.id, new.note, new.category);
+END;
+CREATE TRIGGER IF NOT EXISTS expenses_fts_ad AFTER DELETE ON expenses BEGIN
+    INSERT INTO expenses_fts(expenses_fts, rowid, note, category) VALUES ('delete', old.id, old.note, old.category);
+END;
+CREATE TRIGGER IF NOT EXISTS expenses_fts_au AFTER UPDATE ON expenses BEGIN
+    INSERT INTO expenses_fts(expenses_fts, rowid, note, category) VALUES ('delete', old.id, old.note, old.category);
+    INSERT INTO expenses_fts(rowid, note, category) VALUES (new.id, new.note, new.category);
+END;
+"""
+
+# Connection tuning: fewer fsyncs per write (WAL + NORMAL), temp tables in RAM,
+# ~64 MB page cache and memory-mapped reads.
+PRAGMAS_SQL = """
+PRAGMA synchronous=NORMAL;
+PRAGMA temp_store=MEMORY;
+PRAGMA cache_size=-64000;
+PRAGMA mmap_size=268435456;
+PRAGMA foreign_keys=ON;
+"""
+
+# Prepared statements kept by each connection (keyed by SQL text), the default is 128.
+STATEMENT_CACHE_SIZE = 512
+
+class Connection(sqlite3.Connection):
+    """sqlite3.Connection that supports weak references (see reports._cached)."""
+    __slots__ = ("__weakref__",)
+
 def get_connection(db_path: str | Path) -> sqlite3.Connection:
     """Open the connection with SQLite.
 
@@ -34,12 +81,26 @@ def get_connection(db_path: str | Path) -> sqlite3.Connection:
     path = str(db_path)
     
     try:
-        conn = sqlite3.connect(path)
+        conn = sqlite3.connect(path, cached_statements=STATEMENT_CACHE_SIZE, factory=Connection)
         conn.row_factory = sqlite3.Row
-        return conn
     except Exception:
         logger.exception("Failed to connect to DB at %s", path)
         raise
+    
+    # WAL is not available for in-memory databases, they keep their own journal.
+    if path != ":memory:":
+        try:
+            conn.execute("PRAGMA journal_mode=WAL;")
+        except sqlite3.DatabaseError:
+            logger.warning("WAL journal mode not available for %s", path)
+    
+    try:
+        conn.executescript(PRAGMAS_SQL)
+        return conn
+    except Exception:
+        logger.exception("Failed to configure the connection to %s", path)
+        conn.close()
+        raise
 
 def init_db(conn: sqlite3.Connection) -> None:
     """Create a basic schema and indexes.
@@ -50,8 +111,8 @@ def init_db(conn: sqlite3.Connection) -> None:
     try:
         cursor = conn.cursor()
         cursor.executescript(SCHEMA_SQL)
-        for statement in INDEXES_SQL:
-            cursor.execute(statement)
+        _ensure_indexes(conn)
+        init_fts(conn)
         conn.commit() 
         logger.info("Database schena created.")
         
@@ -65,3 +126,87 @@ def init_db(conn: sqlite3.Connection) -> None:
         except Exception:
             logger.warning("Failed to close the cursor in init_db")
         
+
+def _ensure_indexes(conn: sqlite3.Connection) -> None:
+    """Create the indexes of the list/report queries and refresh the planner statistics.
+    
+    ANALYZE scans every index, so it only runs once the table is big enough for the 
+    statistics (sqlite_stat1) to change the plan; smaller tables are kept up to date 
+    by the PRAGMA optimize of close_connection.
+
+    Args:
+        conn: Active SQLite connection.
+    """
+    for statement in INDEXES_SQL:
+        conn.execute(statement)
+    for statement in OBSOLETE_INDEXES_SQL:
+        conn.execute(statement)
+    
+    (count,) = conn.execute("SELECT COUNT(*) FROM expenses;").fetchone()
+    if count > ANALYZE_MIN_ROWS:
+        conn.execute("ANALYZE expenses;")
+
+# has_fts result by connection (only Connection supports weak references)
+_FTS_PRESENT: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+def has_fts(conn: sqlite3.Connection) -> bool:
+    """Check if the full text index (expenses_fts) exists in the database.
+    
+    The answer is kept for the lifetime of the connection (init_fts updates it).
+
+    Args:
+        conn: Active SQLite connection.
+
+    Returns:
+        bool: True if the text filter can use FTS5 MATCH.
+    """
+    try:
+        present = _FTS_PRESENT.get(conn)
+    except TypeError:
+        present = None
+        cacheable = False
+    else:
+        cacheable = True
+    
+    if present is None:
+        row = conn.execute("SELECT 1 FROM sqlite_master WHERE type='table' AND name='expenses_fts'").fetchone()
+        present = row is not None
+        if cacheable:
+            _FTS_PRESENT[conn] = present
+    return present
+
+def init_fts(conn: sqlite3.Connection) -> None:
+    """Create the FTS5 index of note and category and its sync triggers.
+    
+    Existing expenses are indexed when the index is created. If SQLite was built 
+    without FTS5 nothing is created and the text filter keeps using LIKE.
+
+    Args:
+        conn: Active SQLite connection.
+    """
+    created = not has_fts(conn)
+    try:
+        conn.executescript(FTS_SQL)
+    except sqlite3.OperationalError:
+        logger.warning("FTS5 is not available, the text filter will use LIKE.")
+        return
+    if created and isinstance(conn, Connection):
+        _FTS_PRESENT[conn] = True
+    
+    if created:
+        conn.execute("INSERT INTO expenses_fts(expenses_fts) VALUES ('rebuild');")
+        conn.commit()
+        logger.info("Full text index created.")
+
+def close_connection(conn: sqlite3.Connection) -> None:
+    """Refresh the planner statistics (PRAGMA optimize) and close the connection.
+
+    Args:
+        conn: Active SQLite connection.
+    """
+    try:
+        conn.execute("PRAGMA optimize;")
+    except sqlite3.Error:
+        logger.warning("PRAGMA optimize failed before closing the connection.")
+    finally:
+        conn.close()
@@ -1,26 +1,122 @@
 # exporters.py
 
 from __future__ import annotations
-from typing import Any, Dict, List
+from typing import Any, BinaryIO, Iterable, Iterator, List, Mapping
+from contextlib import contextmanager
+from operator import itemgetter
 from pathlib import Path
 import csv 
+import itertools
 import json
+import os
+import tempfile
 
-def export_to_csv(rows: List[Dict[str, Any]], *, 
+# Buffer of the export files (fewer and larger write calls)
+WRITE_BUFFER_SIZE = 1 << 20
+
+# orjson is optional, the stdlib json module is used when it is not installed.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Process umask, read once at import: os.umask can only be queried by setting it,
+# which is not safe to do while other threads create files.
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+@contextmanager
+def atomic_open(path: Path, mode: str, **kwargs) -> Iterator[Any]:
+    """Open a temporary file next to path and move it into place when the block succeeds.
+
+    A failed export leaves the destination untouched and removes the temporary file.
+
+    Args:
+        path (Path): Final destination.
+        mode (str): File mode ('w' or 'wb').
+        **kwargs: Extra arguments for open (encoding, newline).
+
+    Yields:
+        Open file object with a large write buffer.
+    """
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f"{path.name}.", suffix=".part")
+    try:
+        # mkstemp creates the file as 0600, use the regular permissions instead.
+        os.chmod(tmp, 0o666 & ~_UMASK)
+        with os.fdopen(fd, mode, buffering=WRITE_BUFFER_SIZE, **kwargs) as file:
+            yield file
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except FileNotFoundError:
+            pass
+        raise
+
+def dumps_json(obj: Any, *, pretty: bool = False) -> bytes:
+    """Encode an object as UTF-8 JSON (orjson if available, stdlib json otherwise).
+
+    Args:
+        obj (Any): Object to encode, sqlite3.Row values are encoded as objects.
+        pretty (bool): Indent with 2 spaces. Defaults to False.
+
+    Returns:
+        bytes: Encoded JSON.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, default=dict, option=(orjson.OPT_INDENT_2 if pretty else 0))
+    
+    # Same separators as orjson: compact (",", ":"), or (",", ": ") when indented
+    return json.dumps(obj, ensure_ascii=False, indent=(2 if pretty else None), default=dict,
+                      separators=(",", ": " if pretty else ":")).encode("utf-8")
+
+def write_json(rows: Iterable[Mapping[str, Any]], file: BinaryIO, *, pretty: bool = False) -> int:
+    """Write the rows as a JSON array, encoding one row at a time.
+
+    The output is the same as encoding the whole list at once, without building 
+    the list or the full encoded string in memory.
+
+    Args:
+        rows (Iterable[Mapping[str, Any]]): Rows to write (dicts or sqlite3.Row).
+        file (BinaryIO): Open binary stream.
+        pretty (bool): Indent with 2 spaces. Defaults to False.
+
+    Returns:
+        int: Number of rows written.
+    """
+    opening, separator, closing = (b"[\n  ", b",\n  ", b"\n]") if pretty else (b"[", b",", b"]")
+    
+    count = 0
+    for row in rows:
+        chunk = dumps_json(row, pretty=pretty)
+        # Nested one level inside the array
+        if pretty:
+            chunk = chunk.replace(b"\n", b"\n  ")
+        file.write(separator if count else opening)
+        file.write(chunk)
+        count += 1
+    
+    file.write(closing if count else b"[]")
+    return count
+
+def export_to_csv(rows: Iterable[Mapping[str, Any]], *, 
                   dest: str, 
                   columns: List[str], 
                   overwrite: bool = False
-) -> None:
+) -> int:
     """Export the selected data to a CSV file.
 
     Args:
-        rows (List[Dict[str, Any]]): List to export.
+        rows (Iterable[Mapping[str, Any]]): Rows to export.
         dest (str): Destination path for the file.
         columns (List[str]): Columns to export
         overwrite (bool, optional): In case the file already exists (situational). Defaults to False.
 
     Raises:
         FileExistsError: If the file already exists.
+        
+    Returns:
+        int: Number of rows exported.
     """
     path = Path(dest)
     
@@ -31,30 +127,41 @@ def export_to_csv(rows: List[Dict[str, Any]], *,
     # Creating the CSV file
     path.parent.mkdir(parents=True, exist_ok=True)
     
-    with path.open(mode="w", newline="", encoding="utf-8") as file:
+    with atomic_open(path, "w", newline="", encoding="utf-8") as file:
         writer = csv.writer(file)
         
         writer.writerow(columns)
         
-        for row in rows:
-            writer.writerow([row.get(column) for column in columns])
+        # Rows are written in one call, itemgetter builds each row tuple in C.
+        get_columns = itemgetter(*columns)
+        if len(columns) == 1:
+            values = ((get_columns(row),) for row in rows)
+        else:
+            values = (get_columns(row) for row in rows)
+        # The counter advances once per written row.
+        counter = itertools.count()
+        writer.writerows(value for value, _ in zip(values, counter))
     
+    return next(counter)
 
-def export_to_json(rows: List[Dict[str, Any]], *, 
+def export_to_json(rows: Iterable[Mapping[str, Any]], *, 
                    dest: str, 
                    overwrite: bool = False, 
                    pretty: bool = False
-) -> None:
+) -> int:
     """Export the selected data to a JSON file.
 
     Args:
-        rows (List[Dict[str, Any]]): List to export.
+        rows (Iterable[Mapping[str, Any]]): Rows to export.
         dest (str): Destination path for the file.
         overwrite (bool): In case the file already exists (situational). Defaults to False.
         pretty (bool): Format (optional).
 
     Raises:
         FileExistsError: If the file already exists.
+        
+    Returns:
+        int: Number of rows exported.
     """
     path = Path(dest)
     
@@ -64,7 +171,7 @@ def export_to_json(rows: List[Dict[str, Any]], *,
     
     # Creating the JSON file
     path.parent.mkdir(parents=True, exist_ok=True)
-    with path.open(mode="w", encoding="utf-8") as file:
-        json.dump(rows, file, ensure_ascii=False, indent=(2 if pretty else None))
+    with atomic_open(path, "wb") as file:
+        return write_json(rows, file, pretty=pretty)
                   
     
@@ -1,26 +1,34 @@
 # logger.py
 
 from __future__ import annotations
-from logging.handlers import RotatingFileHandler
+from functools import lru_cache
+from logging.handlers import MemoryHandler, RotatingFileHandler
 from pathlib import Path
-from platformdirs import user_log_dir
+import atexit
 import logging
 
 APP_NAME = "ExpenseTracker"
 LOG_FILENAME = "tracker.log"
 
+# Shared by every handler
+LOG_FORMATTER = logging.Formatter(fmt = "%(asctime)s [%(levelname)s] %(name)s: %(message)s",
+                                  datefmt="%Y-%m-%d %H:%M:%S",)
+
+@lru_cache(maxsize=1)
 def get_log_path() -> Path:
-    """Get the Path to the main file of the program
+    """Get the Path to the main file of the program (the directory is created once)
 
     Returns:
         Path: A path with the log file name added
     """
+    from platformdirs import user_log_dir
+    
     base = Path(user_log_dir(APP_NAME))
     base.mkdir(parents=True, exist_ok=True)
     return base / LOG_FILENAME
 
 def logging_cfg(debug: bool = False) -> logging.Logger:
-    """Configures a rotational logger in the right file path.
+    """Configures a rotational logger in the right file path (buffered unless debug is on).
 
     Args:
         debug (bool, optional): debug instruction.
@@ -28,32 +36,49 @@ def logging_cfg(debug: bool = False) -> logging.Logger:
     Returns:
         logging.Logger: A rotational File Logger.
     """
+    level = logging.DEBUG if debug else logging.INFO
+    logger = logging.getLogger("expense_tracker")
+    
+    # Already configured with the same level
+    if logger.handlers and logger.level == level:
+        return logger
+    
     # Establishing the file path
     log_path = get_log_path() 
     
-    logger = logging.getLogger("expense_tracker")
-    logger.setLevel(logging.DEBUG if debug else logging.INFO)
+    logger.setLevel(level)
     # Preventing duplication of logging
     logger.propagate = False 
     
-    # Cleaning the old handlers
+    # Cleaning the old handlers (and the file behind a memory handler)
     if logger.handlers:
+        for handler in logger.handlers:
+            target = getattr(handler, "target", None)
+            handler.close()
+            if target is not None:
+                target.close()
         logger.handlers.clear()
-        
-    # Format 
-    format_builder = logging.Formatter(fmt = "%(asctime)s [%(levelname)s] %(name)s: %(message)s",
-                                       datefmt="%Y-%m-%d %H:%M:%S",)
     
     # Rotation (by size)
     file_handler = RotatingFileHandler(log_path, maxBytes=1_000_000, backupCount=5, encoding="utf-8")
-    file_handler.setFormatter(format_builder)
-    file_handler.setLevel(logging.DEBUG if debug else logging.INFO)
-    logger.addHandler(file_handler)
+    file_handler.setFormatter(LOG_FORMATTER)
+    file_handler.setLevel(level)
+    
+    if debug:
+        # Debug runs write every record right away.
+        logger.addHandler(file_handler)
+    else:
+        # Records are buffered and written in one go: at exit, when the buffer 
+        # is full or as soon as an error is logged.
+        memory_handler = MemoryHandler(capacity=1024, target=file_handler)
+        memory_handler.setLevel(level)
+        logger.addHandler(memory_handler)
+        atexit.register(memory_handler.flush)
     
     # Handler console (Debug)
     if debug:
         console = logging.StreamHandler()
-        console.setFormatter(format_builder)
+        console.setFormatter(LOG_FORMATTER)
         console.setLevel(logging.DEBUG)
         logger.addHandler(console)
     
@@ -19,13 +19,11 @@ def render_expenses_table(rows: List[Dict]) -> str:
     # Format
     header = f"{'ID':<5} {'Date':<12} {'Category':<15} {'Amount':>12}  Note"
     line = "-" * len(header)
-    out_lines = [header, line]
-    
-    for r in rows:
-        out_lines.append(
-            f"{r['id']:<5} {r['date']:<12} {r['category']:<15} {r['amount']:>12.2f}  {r['note'] or ''}"
-        )
-    return "\n".join(out_lines)
+    body = [
+        f"{r['id']:<5} {r['date']:<12} {r['category']:<15} {r['amount']:>12.2f}  {r['note'] or ''}"
+        for r in rows
+    ]
+    return "\n".join((header, line, *body))
 
 def render_report_by_category(rows: List[Dict[str, Any]]) -> str:
     """Render a readable table for the category aggregates.
@@ -43,17 +41,15 @@ def render_report_by_category(rows: List[Dict[str, Any]]) -> str:
     # Format
     header = f"{'Category':<20} {'Total':>12} {'Count':>7} {'%':>6}"
     line = "-" * len(header)
-    out_lines = [header, line]
-
-    for r in rows:
-        out_lines.append(
-            f"{str(r['category']):<20} "
-            f"{float(r['total']):>12.2f} "
-            f"{int(r['count']):>7d} "
-            f"{float(r['pct_total']):>6.1f}"
-        )
+    body = [
+        f"{str(r['category']):<20} "
+        f"{float(r['total']):>12.2f} "
+        f"{int(r['count']):>7d} "
+        f"{float(r['pct_total']):>6.1f}"
+        for r in rows
+    ]
     
-    return "\n".join(out_lines)
+    return "\n".join((header, line, *body))
 
 def render_report_range(summary: Dict | None) -> str:
     """Render a readable summary with total, count and average within a date range.
@@ -1,84 +1,86 @@
 # reports.py
 
 from __future__ import annotations
-from typing import Any, Dict, List, Optional
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional
 import sqlite3
+import weakref
 
-def where_builder_category(params: Dict[str, Any]) -> tuple[List[str], List[Any]]:
-    """Builds a WHERE clause from the filters dictionary.
+from .db import has_fts
+from .services import where_builder, where_sql
+
+# Report results by connection: (generation, {(report, filters): result}), see _cached.
+# The entries go away with their connection.
+REPORT_CACHE_SIZE = 128
+_RESULTS: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+# The global total of every category is computed in SQL, before the LIMIT (the WHERE 
+# filters go between CATEGORY_SQL and CATEGORY_TAIL_SQL).
+if sqlite3.sqlite_version_info >= (3, 25, 0):
+    # Window sum over the groups
+    CATEGORY_SQL = ("SELECT category, SUM(amount) AS total, COUNT(*) AS count, "
+                    "100.0 * SUM(amount) / SUM(SUM(amount)) OVER () AS pct_total FROM expenses")
+    CATEGORY_TAIL_SQL = " GROUP BY category HAVING SUM(amount) IS NOT NULL ORDER BY total DESC"
+else:
+    # Window functions require SQLite 3.25+, the groups are summed from a CTE instead.
+    CATEGORY_SQL = ("WITH agg AS (SELECT category, SUM(amount) AS total, COUNT(*) AS count "
+                    "FROM expenses")
+    CATEGORY_TAIL_SQL = (" GROUP BY category HAVING SUM(amount) IS NOT NULL) "
+                         "SELECT category, total, count, 100.0 * total / (SELECT SUM(total) FROM agg) AS pct_total "
+                         "FROM agg ORDER BY total DESC")
+# The average is total / count (amount is NOT NULL), computed in Python.
+RANGE_SQL = "SELECT COALESCE(SUM(amount), 0.0) AS total, COUNT(*) AS count FROM expenses"
+
+@lru_cache(maxsize=64)
+def _build_sql_template(base_sql: str, filters_mask: int, tail: str = "") -> str:
+    """Assemble (once per filters mask) the SQL of a report.
 
     Args:
-        params: Filters.
+        base_sql: SELECT ... FROM expenses.
+        filters_mask: Mask of the active filters returned by services.where_builder.
+        tail (optional): GROUP BY / ORDER BY / LIMIT clauses.
 
     Returns:
-        where, parameters (tuple[List[str], List[Any]]): A tuple of two lists: the WHERE clauses and the parameters.
+        str: SQL with '?' placeholders in the order of the parameters.
     """
-    where = []
-    parameters = []
-    
-    # Knowing which WHERE are going to be added (all can be added at the same time)
-    if params.get("date_from") is not None:
-        where.append("date >= ?")
-        parameters.append(params["date_from"])
-        
-    if params.get("date_to") is not None:
-        where.append("date <= ?")
-        parameters.append(params["date_to"])
-        
-    if params.get("min_amount") is not None:
-        where.append("amount >= ?")
-        parameters.append(params["min_amount"])
-        
-    if params.get("max_amount") is not None:
-        where.append("amount <= ?")
-        parameters.append(params["max_amount"])
-    
-    text = params.get("text")
-    if text:
-        like = f"%{text}%"
-        where.append("(note LIKE ? OR category LIKE ?)")
-        parameters.extend([like, like])
-        
-    return where, parameters
+    return base_sql + where_sql(filters_mask) + tail
 
-def where_builder_range(*,
-                  date_from: Optional[str] = None,
-                  date_to: Optional[str] = None,
-                  min_amount: Optional[float] = None,
-                  max_amount: Optional[float] = None,
-                  text: Optional[str] = None,
-) -> tuple[list[str], list[Any]]:
-    """Builds a WHERE clause to filter the range summary.
+def _cached(report: Callable[..., Any], conn: sqlite3.Connection, filters: Dict[str, Any]) -> Any:
+    """Run a report, or return its result from the cache of the connection for the same filters.
+    
+    The cache of a connection is emptied when its data changes: conn.total_changes 
+    counts every write of the connection (services or raw SQL) and PRAGMA data_version 
+    the commits of other connections. Nothing is cached inside a transaction, its 
+    writes may still be rolled back. Connections that don't support weak references 
+    (plain sqlite3.connect, see db.Connection) are not cached.
 
     Args:
-        date_from: Start date. 
-        date_to: End date. 
-        min_amount (optional): Min amount of the expense.
-        max_amount (optional): Max amount of the expense.
-        text (optional): Text to label note or category.
+        report: Uncached report function.
+        conn: Active SQLite connection.
+        filters: Keyword arguments of the report.
 
     Returns:
-        tuple[list[str], list[Any]]:  A tuple of two lists: the WHERE clauses and the parameters.
+        Any: Result of the report (shared with the cache).
     """
-    where = ["date BETWEEN ? AND ?"]
-    parameters = [date_from, date_to]
-    
-    # WHERE filteres 
-    if min_amount is not None:
-        where.append("amount >= ?")
-        parameters.append(min_amount)
-        
-    if max_amount is not None:
-        where.append("amount <= ?")
-        parameters.append(max_amount)
+    if conn.in_transaction:
+        return report(conn, **filters)
     
-    if text:
-        like = f"%{text}%"
-        where.append("(note LIKE ? OR category LIKE ?)")
-        parameters.extend([like, like])
-    
-    return where, parameters
+    generation = (conn.total_changes, conn.execute("PRAGMA data_version;").fetchone()[0])
+    key = (report, tuple(filters.items()))
+    # Unhashable filters and connections without weak references are not cached
+    try:
+        hash(key)
+        entry = _RESULTS.get(conn)
+    except TypeError:
+        return report(conn, **filters)
     
+    if entry is None or entry[0] != generation or len(entry[1]) >= REPORT_CACHE_SIZE:
+        entry = _RESULTS[conn] = (generation, {})
+    results = entry[1]
+    if key not in results:
+        results[key] = report(conn, **filters)
+    return results[key]
+
 def by_category(conn: sqlite3.Connection, 
                   *,
                   date_from: Optional[str] = None,
@@ -86,6 +88,8 @@ def by_category(conn: sqlite3.Connection,
                   min_amount: Optional[float] = None,
                   max_amount: Optional[float] = None,
                   text: Optional[str] = None,
+                  top: Optional[int] = None,
+                  use_fts: bool = True,
 ) -> List[Dict[str, Any]]:
     """SQL query to aggregate expenses using optional filters.
 
@@ -96,43 +100,56 @@ def by_category(conn: sqlite3.Connection,
         min_amount (optional): Min amount.
         max_amount (optional): Max amount.
         text (optional): Text to label note or category.
+        top (optional): Only the top N categories by total (percentages stay over all of them).
+        use_fts (optional): Search the text with the full text index when the database has it.
 
     Returns:
         List[Dict[str, Any]]: List of aggregated rows. 
     """
+    result = _cached(_by_category, conn, {"date_from": date_from, "date_to": date_to,
+                                          "min_amount": min_amount, "max_amount": max_amount,
+                                          "text": text, "top": top, "use_fts": use_fts})
+    # Copies, the cached result must not be modified by the caller
+    return [dict(row) for row in result]
+
+def _by_category(conn: sqlite3.Connection, 
+                  *,
+                  date_from: Optional[str] = None,
+                  date_to: Optional[str] = None,
+                  min_amount: Optional[float] = None,
+                  max_amount: Optional[float] = None,
+                  text: Optional[str] = None,
+                  top: Optional[int] = None,
+                  use_fts: bool = True,
+) -> List[Dict[str, Any]]:
+    """by_category without the results cache."""
     # SQL with optional WHERE filters 
-    where, parameters =  where_builder_category(locals())
-    sql = "SELECT category, SUM(amount) AS total, COUNT(*) AS count FROM expenses"
-    if where:
-        sql += " WHERE " + " AND ".join(where)
-    sql += " GROUP BY category ORDER BY total DESC"
+    use_fts = use_fts and bool(text) and has_fts(conn)
+    mask, parameters = where_builder({"date_from": date_from, "date_to": date_to,
+                                      "min_amount": min_amount, "max_amount": max_amount,
+                                      "text": text}, use_fts=use_fts)
+    tail = CATEGORY_TAIL_SQL
+    if top is not None:
+        if not isinstance(top, int) or top <= 0:
+            raise ValueError("top must be a positive integer.")
+        tail += " LIMIT ?"
+        parameters.append(top)
+    sql = _build_sql_template(CATEGORY_SQL, mask, tail)
     
-    # SQL connection 
+    # SQL connection (plain tuples, the columns are unpacked by position)
     cursor = conn.cursor()
-    cursor.execute(sql, parameters)
-    rows = cursor.fetchall()
+    cursor.row_factory = None
+    rows = cursor.execute(sql, parameters).fetchall()
     
-    if not rows:
-        return []
-    
-    # Percentages
-    total_global = sum(float(row["total"]) for row in rows if row["total"] is not None)
-    if total_global == 0:
+    # The percentage is NULL when the global total is 0 (division by zero in SQLite)
+    if not rows or rows[0][3] is None:
         return []
     
     # Format
-    result = []
-    for row in rows:
-        total = float(row["total"] or 0.0)
-        count = int(row["count"] or 0)
-        percentage = (total / total_global) * 100.0 if total_global else 0.0
-        result.append({
-            "category": str(row["category"]),
-            "total": total,
-            "count": count,
-            "pct_total": percentage,   
-        })
-    return result
+    return [
+        {"category": category, "total": total, "count": count, "pct_total": pct_total}
+        for category, total, count, pct_total in rows
+    ]
         
     
 def range_summary(conn: sqlite3.Connection, 
@@ -142,6 +159,7 @@ def range_summary(conn: sqlite3.Connection,
                   min_amount: Optional[float] = None,
                   max_amount: Optional[float] = None,
                   text: Optional[str] = None,
+                  use_fts: bool = True,
 ) -> Optional[Dict[str, Any]]:
     """Return total, average and count for an expense within a date range.
 
@@ -152,30 +170,47 @@ def range_summary(conn: sqlite3.Connection,
         min_amount (Optional[float], optional): Min amount of the expense.
         max_amount (Optional[float], optional): Max amount of the expense.
         text (Optional[str], optional): Text to label note or category.
+        use_fts (bool, optional): Search the text with the full text index when the database has it.
 
     Returns:
         Optional[Dict[str, Any]]: Dictionary with total, count and average values.
     """
-    where, parameters = where_builder_range(date_from =date_from, date_to=date_to,
-                                            min_amount=min_amount, max_amount=max_amount,
-                                            text=text,)
+    summary = _cached(_range_summary, conn, {"date_from": date_from, "date_to": date_to,
+                                             "min_amount": min_amount, "max_amount": max_amount,
+                                             "text": text, "use_fts": use_fts})
+    # Copy, the cached result must not be modified by the caller
+    return dict(summary) if summary is not None else None
+
+def _range_summary(conn: sqlite3.Connection, 
+                  *,
+                  date_from: str,
+                  date_to: str,
+                  min_amount: Optional[float] = None,
+                  max_amount: Optional[float] = None,
+                  text: Optional[str] = None,
+                  use_fts: bool = True,
+) -> Optional[Dict[str, Any]]:
+    """range_summary without the results cache."""
+    mask, parameters = where_builder({"date_from": date_from, "date_to": date_to,
+                                      "min_amount": min_amount, "max_amount": max_amount,
+                                      "text": text}, 
+                                     required_range=True,
+                                     use_fts=(use_fts and bool(text) and has_fts(conn)),)
     # SQL Query
-    sql = ("SELECT SUM(amount) AS total, COUNT(*) AS count, AVG(amount) AS avg "
-    "FROM expenses WHERE " + " AND ".join(where)
-    )
+    sql = _build_sql_template(RANGE_SQL, mask)
     
     # SQL connection
     cursor = conn.cursor()
     cursor.execute(sql, parameters)
-    row = cursor.fetchone()
+    total, count = cursor.fetchone()
     
-    if row is None or int(row["count"]) == 0:
+    if count == 0:
         return None
     
     return {
-        "total": float(row["total"] or 0.0),
-        "count": int(row["count"]),
-        "avg": float(row["avg"] or 0.0),
+        "total": total,
+        "count": count,
+        "avg": total / count,
     }
           
     
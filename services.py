@@ -1,10 +1,193 @@
 # services.py 
 
 from __future__ import annotations
-from typing import Any, Dict, List, Optional
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
 import sqlite3
 
+from .db import has_fts
+from .validators import validate_date_iso
+
 VALID_ORDER_BY = {"amount", "date", "category", "id"}
+# ORDER BY clause by (order_by, desc), the id is the tie-breaker of the other columns.
+_ORDER_SUFFIX = {
+    (column, desc): (f" ORDER BY id {'DESC' if desc else 'ASC'}" if column == "id" 
+                     else f" ORDER BY {column} {'DESC' if desc else 'ASC'}, id {'DESC' if desc else 'ASC'}")
+    for column in VALID_ORDER_BY 
+    for desc in (False, True)
+}
+# Pagination clause by (has_limit, has_offset), OFFSET is only used with a LIMIT.
+_PAGE_SUFFIX = {
+    (False, False): "",
+    (True, False): " LIMIT ?",
+    (True, True): " LIMIT ? OFFSET ?",
+}
+EXPENSE_COLUMNS = ("id", "date", "category", "amount", "note")
+FETCH_ARRAYSIZE = 1000
+
+# Text search: substring LIKE, or word search with the FTS5 index (db.FTS_SQL)
+TEXT_LIKE_SQL = "(note LIKE ? OR category LIKE ?)"
+TEXT_MATCH_SQL = "id IN (SELECT rowid FROM expenses_fts WHERE expenses_fts MATCH ?)"
+
+# Filters of the expenses queries: (name, WHERE fragment). Bit i of a filters mask 
+# enables FILTERS_SQL[i] and the parameters follow the same order.
+FILTERS_SQL = (
+    ("date_range", "date BETWEEN ? AND ?"),
+    ("date_from", "date >= ?"),
+    ("date_to", "date <= ?"),
+    ("category", "category = ?"),
+    ("min_amount", "amount >= ?"),
+    ("max_amount", "amount <= ?"),
+    ("text", TEXT_LIKE_SQL),
+    ("text_match", TEXT_MATCH_SQL),
+)
+FILTER_BITS = {name: 1 << bit for bit, (name, _) in enumerate(FILTERS_SQL)}
+# Filters bound to a single value: (name, mask bit)
+_FILTER_KEYS = tuple((name, FILTER_BITS[name]) 
+                     for name in ("date_from", "date_to", "category", "min_amount", "max_amount"))
+
+# Write statements with a stable text, so the statement cache of the connection 
+# (db.STATEMENT_CACHE_SIZE) skips the prepare step on every call.
+INSERT_SQL = "INSERT INTO expenses (date, category, amount, note) VALUES (?,?,?,?)"
+DELETE_SQL = "DELETE FROM expenses WHERE id=?"
+# A None parameter keeps the current value of its column.
+UPDATE_SQL = ("UPDATE expenses SET date=COALESCE(?, date), category=COALESCE(?, category), "
+              "amount=COALESCE(?, amount), note=COALESCE(?, note) WHERE id=?")
+CLEAR_NOTE_SQL = "UPDATE expenses SET note=NULL WHERE id=?"
+
+def text_filter(text: str, use_fts: bool) -> Tuple[str, List[Any]]:
+    """WHERE fragment and parameters of the text search on note or category.
+
+    Args:
+        text: Text to search.
+        use_fts: Search the words with the FTS5 index, substring LIKE otherwise.
+
+    Returns:
+        Tuple[str, List[Any]]: WHERE fragment and its parameters.
+    """
+    if use_fts:
+        return TEXT_MATCH_SQL, [fts_phrase(text)]
+    like = f"%{text}%"
+    return TEXT_LIKE_SQL, [like, like]
+
+def where_builder(filters: Mapping[str, Any], 
+                  *, 
+                  required_range: bool = False, 
+                  use_fts: bool = False,
+) -> Tuple[int, List[Any]]:
+    """Builds the WHERE filters of the list and report queries.
+
+    Args:
+        filters: date_from, date_to, category, min_amount, max_amount and text 
+            (missing or None keys are not filtered).
+        required_range (optional): Both dates are required and bound in one BETWEEN.
+        use_fts (optional): Search the text with the FTS5 index.
+
+    Returns:
+        Tuple[int, List[Any]]: Mask of the active FILTERS_SQL (see where_sql) and the parameters.
+    """
+    mask = 0
+    parameters: List[Any] = []
+    get = filters.get
+    keys = _FILTER_KEYS
+    if required_range:
+        mask = FILTER_BITS["date_range"]
+        parameters.extend((filters["date_from"], filters["date_to"]))
+        keys = _FILTER_KEYS[2:]
+    
+    for key, bit in keys:
+        value = get(key)
+        if value is not None:
+            mask |= bit
+            parameters.append(value)
+    
+    # An empty text is not a filter (it would match every row)
+    text = get("text")
+    if text is not None and text != "":
+        mask |= FILTER_BITS["text_match" if use_fts else "text"]
+        parameters.extend(text_filter(text, use_fts)[1])
+    
+    return mask, parameters
+
+@lru_cache(maxsize=128)
+def where_sql(mask: int) -> str:
+    """WHERE clause (with its leading space) of a filters mask, empty if no filter is active.
+
+    Args:
+        mask: Mask of the active FILTERS_SQL returned by where_builder.
+
+    Returns:
+        str: " WHERE ..." with '?' placeholders in the order of the parameters.
+    """
+    where = [fragment for bit, (_, fragment) in enumerate(FILTERS_SQL) if mask & (1 << bit)]
+    return " WHERE " + " AND ".join(where) if where else ""
+
+def fts_phrase(text: str) -> str:
+    """Quote a text as a single FTS5 prefix phrase, so its operators (OR, NOT, ...) are not 
+    interpreted and the last word also matches longer words ("caf" matches "cafe").
+
+    Args:
+        text: Text to search.
+
+    Returns:
+        str: FTS5 query.
+    """
+    return '"' + text.replace('"', '""') + '"*'
+
+def next_cursor(rows: List[Mapping[str, Any]], order_by: Optional[str] = None) -> Optional[Tuple[Any, int]]:
+    """Keyset cursor of the page that follows rows (pass it as after).
+
+    Args:
+        rows: Rows of the current page.
+        order_by (optional): Column used to order the page.
+
+    Returns:
+        Optional[Tuple[Any, int]]: (order_by value, id) of the last row, None if the page is empty.
+    """
+    if not rows:
+        return None
+    last = rows[-1]
+    return last[order_by or "id"], last["id"]
+
+def encode_cursor(cursor: Tuple[Any, int], order_by: Optional[str] = None) -> str:
+    """Build the token of a keyset cursor (the reverse of decode_cursor).
+
+    Args:
+        cursor: (order_by value, id) returned by next_cursor.
+        order_by (optional): Column used to order the page.
+
+    Returns:
+        str: Cursor token, "<id>" or "<value>:<id>".
+    """
+    value, last_id = cursor
+    if not order_by or order_by == "id":
+        return str(last_id)
+    return f"{value}:{last_id}"
+
+def decode_cursor(token: str, order_by: Optional[str] = None) -> Tuple[Any, int]:
+    """Parse a keyset cursor token produced by encode_cursor.
+
+    Args:
+        token: Cursor token.
+        order_by (optional): Column used to order the pages.
+
+    Raises:
+        ValueError: If the token does not match the ordering column.
+
+    Returns:
+        Tuple[Any, int]: (order_by value, id) of the last row already seen.
+    """
+    try:
+        if not order_by or order_by == "id":
+            last_id = int(token)
+            return last_id, last_id
+        # Categories may contain ':' so the id is always the last part.
+        value, _, last_id = token.rpartition(":")
+        if not value:
+            raise ValueError(token)
+        return (float(value) if order_by == "amount" else value), int(last_id)
+    except ValueError:
+        raise ValueError(f"Invalid cursor: {token!r} for order_by={order_by or 'id'}.")
 
 def list_expenses(conn: sqlite3.Connection, 
                   *,
@@ -18,23 +201,37 @@ def list_expenses(conn: sqlite3.Connection,
                   desc: bool = False,
                   limit: Optional[int] = None,
                   offset: Optional[int] = None,
-) -> List[Dict[str, Any]]:
+                  after: Optional[Tuple[Any, int]] = None,
+                  legacy_offset: bool = False,
+                  use_fts: bool = True,
+                  columns: Optional[List[str]] = None,
+                  as_dict: bool = False,
+                  stream: bool = False,
+) -> List[sqlite3.Row] | List[Dict[str, Any]] | Iterator[sqlite3.Row] | Iterator[Dict[str, Any]]:
     """Returns a list of expense records optionally filtered, sorted and paginated.
     
-    Every row is a dictionary with the same format: 
+    Every row is a sqlite3.Row (indexable by column name), or a dictionary with 
+    the same format when as_dict is True: 
     {"id": int, "date": str, "category": str, "amount": float, "note": str|None}
+    (only the requested keys when columns is given).
 
     Filters (Optional):
         - date_from / date_to (inclusive): Filter by a date range (ISO format: YYYY-MM-DD)
         - category: Exact match on the category name .
         - min_amount / max_amount: Filter by amount range.
-        - text: String search on note or category.
+        - text: Words to search in note or category (substring search if the 
+          database has no full text index).
         
     Ordering: 
-        - order_by: Sorting by either one of: (amount, date, category or ID).
+        - order_by: Sorting by either one of: (amount, date, category or ID), ID by default
+          when limit or after is set (pages need a stable order).
         - desc: Descending if True, ascending if False.
         - limit: Number of maximum results. 
-        - offset: Number of records to skip (most be a non-negative integer).
+        - offset: Number of records to skip (most be a non-negative integer), SQLite
+          still reads every skipped row so it is only accepted with legacy_offset.
+        - after: Keyset cursor (order_by value, id) of the last row already seen, 
+          the page starts right after it without scanning the skipped rows 
+          (see next_cursor). It seeks on the (order_by, id) index, see db.INDEXES_SQL.
 
     Args:
         conn: Active SQLite connection.
@@ -43,80 +240,231 @@ def list_expenses(conn: sqlite3.Connection,
         category (optional): Category to filter by.
         min_amount (optional): Min amount to filter by. 
         max_amount (optional): Max amount to filter by.
-        text (optional): Substring to search in category or note.
+        text (optional): Words to search in category or note.
         order_by (optional): Order preference of a column.
         desc (optional): Descending order instruction.
         limit (optional): Max number of rows that are showdd. 
-        offset (optional): Starting offset.
+        offset (optional): Starting offset (deprecated, use after).
+        after (optional): Cursor returned by next_cursor or decode_cursor.
+        legacy_offset (optional): Allow the OFFSET paging (random access to a page).
+        use_fts (optional): Search the text with the full text index when the database 
+            has it, False forces the substring LIKE search.
+        columns (optional): Columns to select (subset of EXPENSE_COLUMNS), all by default.
+        as_dict (optional): Convert the rows to dictionaries (e.g. for JSON).
+        stream (optional): Return an iterator instead of a list, the rows are read from 
+            SQLite while iterating (memory stays flat) so the connection must stay open 
+            until the iteration ends (see iter_expenses).
+
+    Raises:
+        ValueError: If an argument is invalid, or offset is given without legacy_offset.
 
     Returns:
         List: List of the expenses normalized using the indications.
     """
-    where = []
-    parameters: List[Any] = []
+    rows = iter_expenses(
+        conn,
+        date_from=date_from,
+        date_to=date_to,
+        category=category,
+        min_amount=min_amount,
+        max_amount=max_amount,
+        text=text,
+        order_by=order_by,
+        desc=desc,
+        limit=limit,
+        offset=offset,
+        after=after,
+        legacy_offset=legacy_offset,
+        use_fts=use_fts,
+        columns=columns,
+    )
     
-    # Filters (Totally optional)
-    if date_from is not None:
-        where.append("date >= ?")
-        parameters.append(date_from)
-    if date_to is not None:
-        where.append("date <= ?")
-        parameters.append(date_to)
-    if category is not None:
-        where.append("category = ?")
-        parameters.append(category)
-    if min_amount is not None:
-        where.append("amount >= ?")
-        parameters.append(min_amount)
-    if max_amount is not None:
-        where.append("amount <= ?")
-        parameters.append(max_amount)
-    if text:
-        where.append("(note LIKE ? OR category LIKE ?)")
-        like = f"%{text}%"
-        parameters.extend([like, like])
-    
-    sql = "SELECT id, date, category, amount, note FROM expenses"
-    # Applying the filters if there are any.
-    if where:
-        sql += " WHERE " + " AND ".join(where)
-    # Ordering the expenses (if the user wants it)
-    if order_by:
-        if order_by not in VALID_ORDER_BY:
-            raise ValueError(f"Invalid order_by: {order_by!r}")
-        sql += f" ORDER BY {order_by} {'DESC' if desc else 'ASC'}"
+    if stream:
+        return map(dict, rows) if as_dict else rows
+    
+    # Rows support r["column"] already, dictionaries are only built on request.
+    if not as_dict:
+        return rows.fetchall()
+    
+    # SQLite already returns int/str/float for the INTEGER/TEXT/REAL columns, no casts needed.
+    return list(map(dict, rows))
+
+def iter_expenses(conn: sqlite3.Connection, 
+                  *,
+                  date_from: Optional[str] = None,
+                  date_to: Optional[str] = None,
+                  category: Optional[str] = None,
+                  min_amount: Optional[float] = None,
+                  max_amount: Optional[float] = None,
+                  text: Optional[str] = None,
+                  order_by: Optional[str] = None,
+                  desc: bool = False,
+                  limit: Optional[int] = None,
+                  offset: Optional[int] = None,
+                  after: Optional[Tuple[Any, int]] = None,
+                  legacy_offset: bool = False,
+                  use_fts: bool = True,
+                  columns: Optional[List[str]] = None,
+) -> Iterator[sqlite3.Row]:
+    """Run the expenses query and iterate the rows as SQLite returns them (no fetchall).
+    
+    Takes the same filters, ordering and pagination as list_expenses. The query is 
+    executed right away (invalid arguments raise here), the rows are read lazily 
+    so the connection must stay open while iterating.
+
+    Args:
+        conn: Active SQLite connection.
+        columns (optional): Columns to select (subset of EXPENSE_COLUMNS), all by default.
+        See list_expenses for the rest of the arguments.
+
+    Raises:
+        ValueError: If a column or another argument is invalid.
+
+    Returns:
+        Iterator[sqlite3.Row]: Expense rows with the selected columns.
+    """
+    # Projection (only the requested columns are read from SQLite)
+    if columns is None:
+        columns = list(EXPENSE_COLUMNS)
+    unknown = [column for column in columns if column not in EXPENSE_COLUMNS]
+    if not columns or unknown:
+        raise ValueError(f"Invalid columns: {unknown or columns!r}")
+    
+    # Filters (Totally optional), the FTS5 index is used when the database has it (created by init_db)
+    mask, parameters = where_builder(
+        {
+            "date_from": date_from,
+            "date_to": date_to,
+            "category": category,
+            "min_amount": min_amount,
+            "max_amount": max_amount,
+            "text": text,
+        },
+        use_fts=bool(text) and use_fts and has_fts(conn),
+    )
+    
+    # Order column
+    if order_by and order_by not in VALID_ORDER_BY:
+        raise ValueError(f"Invalid order_by: {order_by!r}")
+    # A page (limit or cursor) is always ordered, by id if nothing else was asked, 
+    # so the cursor of its last row points to where the next page starts.
+    if not order_by and (limit is not None or after is not None):
+        order_by = "id"
+    # OFFSET paging reads and discards the skipped rows, only kept for the callers that ask for it.
+    if offset is not None and not legacy_offset:
+        raise ValueError("offset requires legacy_offset=True, use after (keyset cursor) instead.")
+    # Keyset pagination (seek after the last row instead of OFFSET)
+    if after is not None:
+        if offset is not None:
+            raise ValueError("after and offset cannot be combined.")
+        if order_by == "id":
+            parameters.append(after[1])
+        else:
+            value, last_id = after
+            parameters.extend((value, value, last_id))
     # Limiting the amount of rows to be showed (optional)
     if limit is not None:
         if not isinstance(limit, int) or limit <= 0:
             raise ValueError("limit must be a positive integer.")
-        sql += " LIMIT ?"
         parameters.append(limit)
         if offset is not None:
             if not isinstance(offset, int) or offset < 0:
                 raise ValueError("offset must be an non negative integer.")
-            sql += " OFFSET ?"
             parameters.append(offset)
+    
+    sql = _build_sql(tuple(columns), mask, order_by, bool(desc), after is not None, 
+                     limit is not None, limit is not None and offset is not None)
             
     cursor = conn.cursor()
+    # Batch size of cursor.fetchmany() for the callers that read by chunks
+    cursor.arraysize = FETCH_ARRAYSIZE
     cursor.execute(sql, parameters)
-    rows = cursor.fetchall()
-    
-    return [
-        {
-            "id": int(r["id"]),
-            "date": str(r["date"]),
-            "category": str(r["category"]),
-            "amount": float(r["amount"]),
-            "note": (r["note"] if r["note"] is not None else None),
-        }
-        for r in rows
-    ]
+    return cursor
             
+@lru_cache(maxsize=64)
+def _build_sql(columns: Tuple[str, ...], 
+               mask: int, 
+               order_by: Optional[str], 
+               desc: bool, 
+               has_after: bool, 
+               has_limit: bool, 
+               has_offset: bool,
+) -> str:
+    """Build (once per query shape) the SQL text of iter_expenses.
+    
+    Queries with the same active filters, ordering and pagination reuse the same 
+    string, so SQLite's statement cache also gets a hit.
+
+    Args:
+        columns: Selected columns.
+        mask: Mask of the active filters (see where_builder).
+        order_by: Order column, already validated.
+        desc: Descending order.
+        has_after: Keyset cursor present.
+        has_limit: LIMIT present.
+        has_offset: OFFSET present.
+
+    Returns:
+        str: SQL with '?' placeholders in the order of FILTERS_SQL, cursor, limit and offset.
+    """
+    # Applying the filters if there are any.
+    sql = f"SELECT {', '.join(columns)} FROM expenses" + where_sql(mask)
+    
+    # Keyset predicate, the id is used as tie-breaker so the pages are deterministic.
+    if has_after:
+        comparison = "<" if desc else ">"
+        sql += " AND " if mask else " WHERE "
+        if order_by == "id":
+            sql += f"id {comparison} ?"
+        else:
+            # Expanded form of (order_by, id) > (?, ?), row values need SQLite 3.15+.
+            sql += f"({order_by} {comparison} ? OR ({order_by} = ? AND id {comparison} ?))"
+    # Ordering the expenses (if the user wants it)
+    if order_by:
+        sql += _ORDER_SUFFIX[(order_by, desc)]
+    return sql + _PAGE_SUFFIX[(has_limit, has_offset)]
+
+def _execute_write(conn: sqlite3.Connection, sql: str, parameters: Any, *, many: bool = False) -> sqlite3.Cursor:
+    """Run a write statement and commit it, unless the caller already opened a transaction.
+    
+    A statement that changed nothing is rolled back instead of committed (no fsync). 
+    To group several writes into one commit, open the transaction first:
+    
+        with conn:
+            conn.execute("BEGIN")
+            add_expense(conn, ...)
+            delete_expense(conn, ...)
+
+    Args:
+        conn: Active SQLite connection.
+        sql: INSERT, UPDATE or DELETE statement.
+        parameters: Statement parameters (a sequence of them when many is True).
+        many (optional): Run the statement with executemany.
+
+    Returns:
+        sqlite3.Cursor: Cursor of the statement (rowcount, lastrowid).
+    """
+    owned = not conn.in_transaction
+    try:
+        cursor = conn.executemany(sql, parameters) if many else conn.execute(sql, parameters)
+    except Exception:
+        if owned:
+            conn.rollback()
+        raise
+    
+    if owned:
+        if cursor.rowcount > 0:
+            conn.commit()
+        else:
+            conn.rollback()
+    return cursor
+
 def add_expense(conn: sqlite3.Connection, *,
                 date: str,
                 category: str,
                 amount: float,
                 note: str | None = None,
+                skip_validate: bool = False,
 ) -> int:
     """Add a new expense in the 'expenses' table. 
 
@@ -126,14 +474,53 @@ def add_expense(conn: sqlite3.Connection, *,
         category: Expense category.
         amount: Expense amount.
         note (optional): Optional note to label the expense.
+        skip_validate (optional): The date was already validated (see add_expenses_bulk).
+
+    Raises:
+        ValueError: If the date is invalid.
 
     Returns:
         int: Inserted row ID. 
     """
-    cursor = conn.execute("INSERT INTO expenses (date, category, amount, note) VALUES (?,?,?,?)", 
-                          (date, category, amount, note),)
-    conn.commit()
-    return int(cursor.lastrowid)
+    if not skip_validate:
+        validate_date_iso(date)
+    # A single row skips executemany and the last_insert_rowid() query of the bulk path
+    return int(_execute_write(conn, INSERT_SQL, (date, category, amount, note)).lastrowid)
+
+def add_expenses_bulk(conn: sqlite3.Connection, 
+                      rows: Iterable[Tuple[str, str, float, Optional[str]]],
+                      *,
+                      skip_validate: bool = False,
+) -> List[int]:
+    """Add many expenses with a single executemany inside one transaction.
+    
+    The rows are consumed lazily (a generator keeps the memory flat). If any row 
+    fails, nothing is inserted (see _execute_write for the transaction handling).
+    
+    The dates are checked with validate_date_iso unless skip_validate is set, for 
+    trusted or already validated input (e.g. a previous export, the CLI parsers). 
+    The schema still rejects a date that is not shaped YYYY-MM-DD (CHECK constraint).
+
+    Args:
+        conn: Active SQLite connection.
+        rows: (date, category, amount, note) tuples.
+        skip_validate (optional): Do not validate the dates in Python.
+
+    Raises:
+        ValueError: If a date is invalid.
+        sqlite3.IntegrityError: If a row breaks a constraint of the schema.
+
+    Returns:
+        List[int]: IDs of the inserted rows, in input order.
+    """
+    if not skip_validate:
+        rows = ((validate_date_iso(date), category, amount, note) for date, category, amount, note in rows)
+    count = _execute_write(conn, INSERT_SQL, rows, many=True).rowcount
+    if not count:
+        return []
+    # The IDs are consecutive, no other writer can insert inside the transaction.
+    last_id = conn.execute("SELECT last_insert_rowid()").fetchone()[0]
+    return list(range(last_id - count + 1, last_id + 1))
 
 def update_expense(conn: sqlite3.Connection, expense_id: int, *,
                    date: str | None = None,
@@ -146,41 +533,30 @@ def update_expense(conn: sqlite3.Connection, expense_id: int, *,
     Args:
         conn: Active SQLite connection.
         expense_id : Expense ID.
-        date, category, amount, note: Optional fields to update.
+        date, category, amount, note: Optional fields to update (None keeps the 
+            current value, see clear_note to remove the note).
 
     Returns:
         int: Number of rows updated. 
     """
-    updates: list[str] = []
-    parameters: list[Any] = []
-    
-    # Checking which fields are been updated.
-    if date is not None:
-        updates.append("date=?")
-        parameters.append(date)
-        
-    if category is not None:
-        updates.append("category=?")
-        parameters.append(category)
-        
-    if amount is not None:
-        updates.append("amount=?")
-        parameters.append(amount)
-        
-    if note is not None:
-        updates.append("note=?")
-        parameters.append(note)
-    
     # If non of the fields are been updated, the action is canceled.
-    if not updates:
+    if date is None and category is None and amount is None and note is None:
         return 0
     
-    # Identification of which ID is going to get the changes.
-    parameters.append(expense_id)
-    sql = f"UPDATE expenses SET {', '.join(updates)} WHERE id=?"
-    cursor = conn.execute(sql, parameters)
-    conn.commit()
-    return int(cursor.rowcount)
+    # The rowcount tells if the ID exists (0 rows), no previous SELECT is needed.
+    return _execute_write(conn, UPDATE_SQL, (date, category, amount, note, expense_id)).rowcount
+
+def clear_note(conn: sqlite3.Connection, expense_id: int) -> int:
+    """Remove the note of an expense (update_expense can't set it to NULL).
+
+    Args:
+        conn: Active SQLite connection.
+        expense_id: Expense ID.
+
+    Returns:
+        int: Number of rows updated.
+    """
+    return _execute_write(conn, CLEAR_NOTE_SQL, (expense_id,)).rowcount
 
 def delete_expense(conn: sqlite3.Connection, expense_id: int) -> int:
     """Delete an expense from 'expenses' table by ID.
@@ -193,8 +569,17 @@ def delete_expense(conn: sqlite3.Connection, expense_id: int) -> int:
         int: Number of rows deleted. 
     """
     # Identification of which ID is going to get deleted
-    cursor = conn.execute("DELETE FROM expenses WHERE id=?", 
-                          (expense_id,))
-    conn.commit()
-    return int(cursor.rowcount)    
+    return _execute_write(conn, DELETE_SQL, (expense_id,)).rowcount
+
+def delete_expenses_bulk(conn: sqlite3.Connection, expense_ids: Iterable[int]) -> int:
+    """Delete many expenses by ID with a single executemany inside one transaction.
+
+    Args:
+        conn: Active SQLite connection.
+        expense_ids: Expense IDs.
+
+    Returns:
+        int: Number of rows deleted.
+    """
+    return _execute_write(conn, DELETE_SQL, ((expense_id,) for expense_id in expense_ids), many=True).rowcount    
         
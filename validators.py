@@ -2,6 +2,11 @@
 
 from __future__ import annotations
 from datetime import date
+import math
+import re
+
+# Strict YYYY-MM-DD shape (fromisoformat also accepts "20250101", "2025-W01-1", ...)
+_ISO_RE = re.compile(r"\d{4}-\d{2}-\d{2}\Z", re.ASCII).match
 
 def validate_date_iso(date_value: str) -> str:
     """Return a string, only if the date format is correct (YYYY-MM-DD).
@@ -19,10 +24,12 @@ def validate_date_iso(date_value: str) -> str:
     if not isinstance(date_value, str):
         raise ValueError("Date must be a string in format: YYYY-MM-DD")
     
-    # Checking if it is in ISO format.
+    # Checking if it is in ISO format, then if the day exists (e.g. 2024-02-30).
+    if not _ISO_RE(date_value):
+        raise ValueError(f"Invalid date: {date_value!r}. YYYY-MM-DD was expected.")
     try:
         date.fromisoformat(date_value)
-    except Exception:
+    except ValueError:
         raise ValueError(f"Invalid date: {date_value!r}. YYYY-MM-DD was expected.")
     
     return date_value
@@ -34,16 +41,29 @@ def validate_amount(amount_value) -> float:
         amount_value (int | float | str): Value to validate.
         
     Raises:
-        ValueError: if the amount is not numeric or is < 0.
+        ValueError: if the amount is not numeric, not finite or is < 0.
 
     Returns:
         float: Amount in a float type.
     """
-    # Checking if the value is numeric
-    try: 
-        value = float(amount_value)
-    except Exception:
+    # bool is an int subclass, float(True) would be 1.0
+    if isinstance(amount_value, bool):
         raise ValueError(f"amount must be numeric; got {amount_value!r}.")
+    # Checking if the value is numeric (numbers skip the conversion attempt)
+    if isinstance(amount_value, (int, float)):
+        # Integers too big for a float (e.g. 10**400)
+        try:
+            value = float(amount_value)
+        except OverflowError:
+            raise ValueError("amount is too large.")
+    else:
+        try: 
+            value = float(amount_value)
+        except Exception:
+            raise ValueError(f"amount must be numeric; got {amount_value!r}.")
+    # nan and inf are parsed by float() but are not amounts.
+    if math.isnan(value) or math.isinf(value):
+        raise ValueError(f"amount must be a finite number; got {amount_value!r}.")
     # Checking if the value is higher than 0. 
     if value <= 0: 
         raise ValueError("amount must be > 0.")
@@ -72,6 +92,17 @@ def validate_category(category_str: str) -> str:
     
     return out
 
+def normalize_category_filter(category_str: str) -> str | None:
+    """Return a stripped category to filter by, or None if it is blank.
+
+    Args:
+        category_str (str): Category string given as a filter.
+
+    Returns:
+        str | None: Stripped category, None when there is nothing to filter by.
+    """
+    return category_str.strip() or None
+
 def validate_id(id_value) -> int:
     """Return a positive integer ID.
 
@@ -84,11 +115,17 @@ def validate_id(id_value) -> int:
     Returns:
         int: Positive ID integer. 
     """
-    # Checking if the value is an integer
-    try: 
-        id_int = int(id_value)
-    except Exception:
+    # bool is an int subclass, int(True) would be 1
+    if isinstance(id_value, bool):
         raise ValueError(f"ID must be an integer. Instead got {id_value!r}")
+    # Checking if the value is an integer (integers skip the conversion attempt)
+    if isinstance(id_value, int):
+        id_int = id_value
+    else:
+        try: 
+            id_int = int(id_value)
+        except Exception:
+            raise ValueError(f"ID must be an integer. Instead got {id_value!r}")
     # The value must be higher than 0
     if id_int <= 0:
         raise ValueError("ID must be > 0")